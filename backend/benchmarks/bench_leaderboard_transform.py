@@ -0,0 +1,130 @@
+"""
+Micro-benchmark for the ETX leaderboard transform.
+
+Compares the columnar transform_etx_leaderboard in server.py against the original
+row-by-row implementation (kept below as legacy_transform_etx_leaderboard) on the
+recorded fixtures in ./fixtures, after checking that both produce the same entries.
+etx_leaderboard_mixed.json is built from the two recordings and mixes their key variants
+(and drops some fields) row by row, to check the per-row fallback of the columnar transform.
+
+Usage (from the backend directory):
+    python -m benchmarks.bench_leaderboard_transform [--repeat 2000] [--scale 1]
+"""
+
+import argparse
+import json
+import sys
+import timeit
+import uuid
+from datetime import datetime, timezone
+from pathlib import Path
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent
+FIXTURES_DIR = Path(__file__).resolve().parent / "fixtures"
+sys.path.insert(0, str(BACKEND_DIR))
+
+from server import transform_etx_leaderboard  # noqa: E402
+
+
+def legacy_transform_etx_leaderboard(etx_data: dict) -> dict:
+    """Row-by-row transform as it was before the columnar rewrite"""
+    entries = []
+
+    raw_entries = etx_data.get("Players", etx_data.get("leaderboard", etx_data.get("entries", etx_data.get("players", []))))
+
+    for idx, item in enumerate(raw_entries):
+        first_name = item.get("FirstName", "")
+        last_name = item.get("LastName", "")
+        player_name = f"{first_name} {last_name}".strip()
+        if not player_name:
+            player_name = item.get("PlayerName", item.get("name", "Unknown"))
+
+        rounds = item.get("Rounds", [])
+        round_scores = {f"r{r.get('RoundNo', i+1)}": r.get("ScoreToPar", 0) for i, r in enumerate(rounds)}
+        round_strokes = {f"r{r.get('RoundNo', i+1)}_strokes": r.get("Strokes", 0) for i, r in enumerate(rounds)}
+
+        current_round_num = item.get("RoundsPlayed", 1)
+        today_score = None
+        for r in rounds:
+            if r.get("RoundNo") == current_round_num:
+                today_score = r.get("ScoreToPar", 0)
+                break
+
+        entry = {
+            "position": item.get("Position", item.get("pos", idx + 1)),
+            "position_moved": item.get("PositionMoved", 0),
+            "player_id": item.get("PlayerId", item.get("player_id", str(uuid.uuid4()))),
+            "etx_player_id": item.get("PlayerId", item.get("id")),
+            "player_name": player_name,
+            "country": item.get("Country", item.get("nationality", "")),
+            "country_code": item.get("CountryCode", item.get("country_code", item.get("nat", ""))),
+            "score_to_par": item.get("ScoreToPar", item.get("total", item.get("score", 0))),
+            "today": today_score if today_score is not None else item.get("today", 0),
+            "thru": item.get("HolesPlayed", item.get("thru", item.get("holesPlayed", item.get("hole", "F")))),
+            "current_round": current_round_num,
+            "total_strokes": item.get("Strokes", item.get("totalStrokes", item.get("strokes", 0))),
+            "photo_url": item.get("imageUrl", item.get("photo", item.get("headshot", ""))),
+            "is_kenyan": item.get("CountryCode", item.get("country_code", "")).upper() == "KEN",
+            "rounds_played": item.get("RoundsPlayed", 0),
+            **round_scores,
+            **round_strokes
+        }
+        entries.append(entry)
+
+    return {
+        "source": "etx",
+        "updated_at": datetime.now(timezone.utc).isoformat(),
+        "tournament_name": etx_data.get("Name", etx_data.get("tournamentName", etx_data.get("TournamentName", "Magical Kenya Open"))),
+        "round": etx_data.get("currentRound", etx_data.get("round", 1)),
+        "status": etx_data.get("status", "in_progress"),
+        "entries": entries
+    }
+
+
+def load_fixture(path: Path, scale: int) -> dict:
+    """Load a recorded payload, optionally repeating its rows to simulate a larger field"""
+    payload = json.loads(path.read_text())
+    if scale > 1:
+        rows_key = next(key for key in ("Players", "leaderboard", "entries", "players") if key in payload)
+        payload[rows_key] = payload[rows_key] * scale
+    return payload
+
+
+def check_equivalent(payload: dict, name: str):
+    """Fail loudly if the two transforms disagree on anything but the fetch time"""
+    legacy = legacy_transform_etx_leaderboard(payload)
+    columnar = transform_etx_leaderboard(payload)
+    legacy.pop("updated_at")
+    columnar.pop("updated_at")
+    if legacy != columnar:
+        for i, (a, b) in enumerate(zip(legacy["entries"], columnar["entries"])):
+            if a != b:
+                raise SystemExit(f"{name}: entry {i} differs\n  legacy:   {a}\n  columnar: {b}")
+        raise SystemExit(f"{name}: transforms differ")
+    if list(legacy["entries"][0]) != list(columnar["entries"][0]):
+        raise SystemExit(f"{name}: entry key order differs")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--repeat", type=int, default=2000, help="transforms per timing run")
+    parser.add_argument("--scale", type=int, default=1, help="repeat fixture rows to simulate a larger field")
+    args = parser.parse_args()
+
+    for path in sorted(FIXTURES_DIR.glob("etx_leaderboard*.json")):
+        payload = load_fixture(path, args.scale)
+        check_equivalent(payload, path.name)
+
+        legacy = min(timeit.repeat(lambda: legacy_transform_etx_leaderboard(payload), number=args.repeat, repeat=5))
+        columnar = min(timeit.repeat(lambda: transform_etx_leaderboard(payload), number=args.repeat, repeat=5))
+        rows = len(transform_etx_leaderboard(payload)["entries"])
+        print(
+            f"{path.name:32} {rows:5} rows  "
+            f"legacy {legacy / args.repeat * 1e6:8.1f} us  "
+            f"columnar {columnar / args.repeat * 1e6:8.1f} us  "
+            f"speedup {legacy / columnar:4.2f}x"
+        )
+
+
+if __name__ == "__main__":
+    main()
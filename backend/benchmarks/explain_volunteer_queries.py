@@ -0,0 +1,110 @@
+"""
+Query-plan check for the volunteer query engine.
+
+Runs explain() on the MongoDB queries built from every default query preset
+(DEFAULT_QUERY_PRESETS in server.py): the sorted list query, the first keyset
+page, and the $match of the statistics aggregation. Prints the winning plan's
+stages and indexes, and exits non-zero if any of them falls back to a COLLSCAN.
+
+Uses MONGO_URL / DB_NAME from backend/.env like the server does.
+
+Usage (from the backend directory):
+    python -m benchmarks.explain_volunteer_queries [--create-indexes]
+"""
+
+import argparse
+import asyncio
+import sys
+from pathlib import Path
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(BACKEND_DIR))
+
+from server import (  # noqa: E402
+    DEFAULT_QUERY_PRESETS,
+    VOLUNTEER_PAGE_SORT,
+    VolunteerQueryFilters,
+    build_volunteer_query,
+    db,
+)
+from mongodb.init_db import create_indexes  # noqa: E402
+
+PAGE_LIMIT = 50
+
+
+def winning_plans(explain: dict) -> list:
+    """Every winningPlan in an explain document (find, or each aggregate $cursor stage)"""
+    plans = []
+    if isinstance(explain, dict):
+        for key, value in explain.items():
+            if key == "winningPlan":
+                # SBE plans nest the classic tree under queryPlan
+                plans.append(value.get("queryPlan", value))
+            elif key != "rejectedPlans":
+                plans.extend(winning_plans(value))
+    elif isinstance(explain, list):
+        for value in explain:
+            plans.extend(winning_plans(value))
+    return plans
+
+
+def plan_stages(plan: dict) -> list:
+    """(stage, indexName) pairs of a plan tree, root first"""
+    stages = [(plan.get("stage"), plan.get("indexName"))]
+    children = plan.get("inputStages", [])
+    if "inputStage" in plan:
+        children = [plan["inputStage"], *children]
+    for child in children:
+        stages.extend(plan_stages(child))
+    return stages
+
+
+async def explain_query(label: str, query: dict) -> list:
+    """Explain the list, first-page and statistics shapes of one query; returns the COLLSCAN labels"""
+    explains = {
+        "list": await db.volunteers.find(query, {"_id": 0}).sort(VOLUNTEER_PAGE_SORT).explain(),
+        "page": await db.volunteers.find(query, {"_id": 0}).sort(VOLUNTEER_PAGE_SORT).limit(PAGE_LIMIT + 1).explain(),
+        "stats": await db.command(
+            "aggregate", "volunteers",
+            pipeline=[{"$match": query}, {"$group": {"_id": None, "total": {"$sum": 1}}}],
+            explain=True,
+        ),
+    }
+
+    collscans = []
+    for shape, explain in explains.items():
+        stages = [stage for plan in winning_plans(explain) for stage in plan_stages(plan)]
+        if not stages:
+            raise SystemExit(f"{label} [{shape}]: no winning plan in explain output")
+        summary = " <- ".join(f"{stage}({index})" if index else stage for stage, index in stages)
+        print(f"  {shape:6} {summary}")
+        if any(stage == "COLLSCAN" for stage, _ in stages):
+            collscans.append(f"{label} [{shape}]")
+    return collscans
+
+
+async def run(create: bool):
+    if create:
+        await create_indexes(db)
+
+    collscans = []
+    for preset in DEFAULT_QUERY_PRESETS:
+        filters = VolunteerQueryFilters(**preset["filters"])
+        query, _ = build_volunteer_query(filters)
+        print(f"{preset['name']}: {query}")
+        collscans.extend(await explain_query(preset["name"], query))
+
+    if collscans:
+        raise SystemExit("COLLSCAN in:\n  " + "\n  ".join(collscans))
+    print(f"{len(DEFAULT_QUERY_PRESETS)} presets, no collection scans")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--create-indexes", action="store_true", help="create the indexes from mongodb/init_db.py first")
+    args = parser.parse_args()
+    asyncio.run(run(args.create_indexes))
+
+
+if __name__ == "__main__":
+    main()
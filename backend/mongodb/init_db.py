@@ -34,12 +34,16 @@ COLLECTIONS = [
     'webmaster_users',
     'webmaster_sessions',
     
+    # Revoked signed session tokens
+    'session_revocations',
+    
     # Tournament data
     'players',
     'leaderboard',
     'tournament_tee_times',
     'player_scores',
     'player_hole_scores',
+    'leaderboard_history',
     'tournaments',
     'tournament_info',
     'tournament_schedule',
@@ -50,6 +54,7 @@ COLLECTIONS = [
     'gallery',
     'sponsors',
     'board_members',
+    'media_library',
     
     # Ticketing and enquiries
     'ticket_packages',
@@ -62,6 +67,7 @@ COLLECTIONS = [
     # Volunteer management
     'volunteers',
     'volunteer_attendance',
+    'roster_versions',
     
     # Marshal dashboard
     'registration_forms',
@@ -87,6 +93,12 @@ COLLECTIONS = [
 ]
 
 
+# Time-series options for collections that store measurements over time
+TIMESERIES_COLLECTIONS = {
+    'leaderboard_history': {'timeField': 'ts', 'metaField': 'meta', 'granularity': 'seconds'},
+}
+
+
 # Index definitions for collections
 INDEXES = {
     'users': [
@@ -110,6 +122,11 @@ INDEXES = {
         {'keys': [('session_id', 1)], 'unique': True},
         {'keys': [('expires_at', 1)], 'expireAfterSeconds': 0},
     ],
+    'session_revocations': [
+        {'keys': [('sid', 1)]},
+        {'keys': [('subject', 1)]},
+        {'keys': [('expires_at', 1)], 'expireAfterSeconds': 0},
+    ],
     'players': [
         {'keys': [('player_id', 1)], 'unique': True},
         {'keys': [('country_code', 1)]},
@@ -119,6 +136,9 @@ INDEXES = {
         {'keys': [('position', 1)]},
         {'keys': [('player_id', 1)]},
     ],
+    'leaderboard_history': [
+        {'keys': [('meta.tournament_id', 1), ('meta.round', 1), ('ts', 1)]},
+    ],
     'tournaments': [
         {'keys': [('is_current', -1)]},
         {'keys': [('year', -1)]},
@@ -133,11 +153,33 @@ INDEXES = {
         {'keys': [('published_at', -1)]},
         {'keys': [('content_type', 1)]},
     ],
+    'media_library': [
+        {'keys': [('media_id', 1)], 'unique': True},
+        {'keys': [('uploaded_at', -1)]},
+        {'keys': [('search_tokens', 1)]},
+    ],
     'volunteers': [
         {'keys': [('volunteer_id', 1)], 'unique': True},
         {'keys': [('email', 1)]},
         {'keys': [('status', 1)]},
         {'keys': [('role', 1)]},
+        {'keys': [('golf_club_key', 1)]},
+        # Word-prefix search (multikey)
+        {'keys': [('search_tokens', 1)]},
+        # Query engine shapes: equality filters first, then the list order
+        # (status, last_name, first_name, volunteer_id) so results come back pre-sorted.
+        # Keyset pagination order of the volunteer lists
+        {'keys': [('status', 1), ('last_name', 1), ('first_name', 1), ('volunteer_id', 1)]},
+        # role + status (scorer and marshal presets)
+        {'keys': [('role', 1), ('status', 1), ('last_name', 1), ('first_name', 1), ('volunteer_id', 1)]},
+        # karen_member + status
+        {'keys': [('is_karen_member', 1), ('status', 1), ('last_name', 1), ('first_name', 1), ('volunteer_id', 1)]},
+        # volunteered_before + role + status (experience filters)
+        {'keys': [('volunteered_before', 1), ('role', 1), ('status', 1)]},
+        # assigned_location / unassigned_only + status
+        {'keys': [('assigned_location', 1), ('status', 1)]},
+        # Day / time-slot filters ($in over the availability bitmask)
+        {'keys': [('availability_mask', 1), ('status', 1)]},
     ],
     'volunteer_attendance': [
         {'keys': [('volunteer_id', 1), ('date', 1)], 'unique': True},
@@ -184,7 +226,11 @@ async def init_collections(db: AsyncIOMotorDatabase) -> Dict[str, bool]:
     for collection_name in COLLECTIONS:
         try:
             # Try to create collection (will fail if exists, which is fine)
-            await db.create_collection(collection_name)
+            timeseries = TIMESERIES_COLLECTIONS.get(collection_name)
+            if timeseries:
+                await db.create_collection(collection_name, timeseries=timeseries)
+            else:
+                await db.create_collection(collection_name)
             results[collection_name] = True
         except Exception:
             # Collection already exists
@@ -1,4 +1,4 @@
-import React, { useState, useEffect, useCallback } from 'react';
+import React, { useState, useEffect, useCallback, useRef } from 'react';
 import { API } from '../App';
 import { Card, CardContent } from '../components/ui/card';
 import { Badge } from '../components/ui/badge';
@@ -40,6 +40,10 @@ export default function LeaderboardPage() {
   // Auto-refresh
   const [autoRefresh, setAutoRefresh] = useState(true);
   const REFRESH_INTERVAL = 20000; // 20 seconds to match backend cache TTL
+  
+  // Live stream (SSE) - falls back to polling if unavailable
+  const [streamFailed, setStreamFailed] = useState(typeof EventSource === 'undefined');
+  const streamEntries = useRef(new Map());
 
   const fetchLeaderboard = useCallback(async () => {
     try {
@@ -103,12 +107,63 @@ export default function LeaderboardPage() {
     }
   }, [activeTab, fetchLeaderboard, fetchTeeTimes, fetchKenyanPlayers]);
 
+  // Apply the same filters as /leaderboard/live to the streamed entries
+  const applyStreamEntries = useCallback(() => {
+    let entries = Array.from(streamEntries.current.values());
+    entries.sort((a, b) => (parseInt(a.position, 10) || 0) - (parseInt(b.position, 10) || 0));
+    if (showKenyanOnly) entries = entries.filter(e => (e.country_code || '').toUpperCase() === 'KEN');
+    if (selectedRound) entries = entries.filter(e => e.current_round === Number(selectedRound));
+    if (topN) entries = entries.slice(0, Number(topN));
+    setLeaderboard(entries);
+  }, [showKenyanOnly, selectedRound, topN]);
+  
+  // Re-filter streamed entries in place when filters change, without reconnecting
+  const applyStreamEntriesRef = useRef(applyStreamEntries);
+  useEffect(() => {
+    applyStreamEntriesRef.current = applyStreamEntries;
+    if (streamEntries.current.size > 0) applyStreamEntries();
+  }, [applyStreamEntries]);
+
+  // Live leaderboard stream: one snapshot, then only the fields that changed
+  useEffect(() => {
+    if (!autoRefresh || activeTab !== 'leaderboard' || streamFailed) return;
+    
+    const source = new EventSource(`${API}/leaderboard/stream`);
+    
+    source.addEventListener('snapshot', (event) => {
+      const data = JSON.parse(event.data);
+      streamEntries.current = new Map((data.entries || []).map(e => [e.player_id, e]));
+      applyStreamEntriesRef.current();
+      setSource(data.source || 'local');
+      setLastUpdated(data.updated_at || new Date().toISOString());
+      setError(null);
+      setLoading(false);
+    });
+    
+    source.addEventListener('delta', (event) => {
+      const data = JSON.parse(event.data);
+      // Deltas carry only the changed fields of existing players
+      (data.changed || []).forEach(e => streamEntries.current.set(e.player_id, { ...streamEntries.current.get(e.player_id), ...e }));
+      (data.removed || []).forEach(id => streamEntries.current.delete(id));
+      applyStreamEntriesRef.current();
+      setLastUpdated(data.updated_at || new Date().toISOString());
+    });
+    
+    source.onerror = () => {
+      // EventSource retries on its own; only give up if the connection is closed for good
+      if (source.readyState === EventSource.CLOSED) setStreamFailed(true);
+    };
+    
+    return () => source.close();
+  }, [autoRefresh, activeTab, streamFailed]);
+
   // Auto-refresh
   useEffect(() => {
     if (!autoRefresh) return;
     
     const interval = setInterval(() => {
       if (activeTab === 'leaderboard') {
+        if (!streamFailed) return; // kept current by the live stream
         fetchLeaderboard();
       } else if (activeTab === 'tee-times') {
         fetchTeeTimes();
@@ -118,7 +173,7 @@ export default function LeaderboardPage() {
     }, REFRESH_INTERVAL);
     
     return () => clearInterval(interval);
-  }, [autoRefresh, activeTab, fetchLeaderboard, fetchTeeTimes, fetchKenyanPlayers]);
+  }, [autoRefresh, activeTab, streamFailed, fetchLeaderboard, fetchTeeTimes, fetchKenyanPlayers]);
 
   // Filter leaderboard by search term
   const filteredLeaderboard = leaderboard.filter(entry => {
@@ -0,0 +1,313 @@
+"""
+Test suite for the live leaderboard APIs
+Tests: ETX status diagnostics, background poller, live leaderboard fallback, SSE stream
+"""
+import pytest
+import requests
+import os
+
+BASE_URL = os.environ.get('REACT_APP_BACKEND_URL', '').rstrip('/')
+
+
+class TestLeaderboardStatus:
+    """Test /api/leaderboard/status endpoint"""
+    
+    def test_status_includes_tournament_fields(self):
+        """Status returns the tournament round and cut line"""
+        response = requests.get(f"{BASE_URL}/api/leaderboard/status")
+        assert response.status_code == 200
+        
+        data = response.json()
+        assert "current_round" in data
+        assert "cut_line" in data
+        assert "source" in data
+        print(f"✓ Tournament status: round {data['current_round']}, source {data['source']}")
+    
+    def test_status_includes_etx_diagnostics(self):
+        """Status reports ETX configuration and fallback availability"""
+        response = requests.get(f"{BASE_URL}/api/leaderboard/status")
+        assert response.status_code == 200
+        
+        data = response.json()
+        assert "etx_configured" in data
+        assert data.get("fallback_available") == True
+        assert "cache_status" in data
+        print(f"✓ ETX configured: {data['etx_configured']}")
+    
+    def test_status_reports_poller_and_snapshot_age(self):
+        """Status reports the background poller and leaderboard snapshot age"""
+        response = requests.get(f"{BASE_URL}/api/leaderboard/status")
+        assert response.status_code == 200
+        
+        poller = response.json().get("poller")
+        assert poller is not None
+        assert "running" in poller
+        assert "interval_seconds" in poller
+        assert "snapshot_age_seconds" in poller
+        
+        if poller["running"]:
+            assert poller["snapshot_age_seconds"] is not None
+        print(f"✓ Poller running: {poller['running']}, snapshot age: {poller['snapshot_age_seconds']}")
+
+    
+    def test_status_reports_single_flight_counters(self):
+        """Status reports how many ETX requests were coalesced"""
+        response = requests.get(f"{BASE_URL}/api/leaderboard/status")
+        assert response.status_code == 200
+        
+        single_flight = response.json().get("single_flight")
+        assert single_flight is not None
+        assert single_flight["upstream_requests"] >= 0
+        assert single_flight["coalesced_requests"] >= 0
+        print(f"✓ Single-flight: {single_flight}")
+
+    
+    def test_status_reports_circuit_breaker(self):
+        """Status reports the ETX circuit breaker state"""
+        response = requests.get(f"{BASE_URL}/api/leaderboard/status")
+        assert response.status_code == 200
+        
+        breaker = response.json().get("circuit_breaker")
+        assert breaker is not None
+        assert breaker["state"] in ("closed", "open", "half_open")
+        assert breaker["failure_threshold"] > 0
+        print(f"✓ Circuit breaker: {breaker['state']}")
+    
+    def test_status_reports_cache_lookups(self):
+        """Status reports cache bounds and per-namespace hit/miss counters"""
+        requests.get(f"{BASE_URL}/api/leaderboard/tee-times?round_num=2")
+        response = requests.get(f"{BASE_URL}/api/leaderboard/status")
+        assert response.status_code == 200
+        
+        cache_status = response.json()["cache_status"]
+        assert cache_status["max_entries"] > 0
+        assert cache_status["evictions"] >= 0
+        assert "tee_times" in cache_status["ttl_seconds"]
+        if "tee_times" in cache_status["lookups"]:
+            assert set(cache_status["lookups"]["tee_times"]) == {"hits", "stale_hits", "misses"}
+        print(f"✓ Cache lookups: {cache_status['lookups']}")
+    
+    def test_leaderboard_snapshot_survives_hole_score_flood(self):
+        """Per-player hole score keys cannot evict the pinned leaderboard snapshot"""
+        cache_status = requests.get(f"{BASE_URL}/api/leaderboard/status").json()["cache_status"]
+        if not cache_status["leaderboard"]["cached"]:
+            pytest.skip("No ETX leaderboard snapshot cached")
+        if cache_status["max_entries"] > 2000:
+            pytest.skip("Cache bound too large to flood in a test")
+        assert "leaderboard" in cache_status["pinned_keys"]
+        
+        for i in range(cache_status["max_entries"] + 10):
+            requests.get(f"{BASE_URL}/api/leaderboard/player/flood-{i}/hole-scores?round_num=1")
+        
+        cache_status = requests.get(f"{BASE_URL}/api/leaderboard/status").json()["cache_status"]
+        assert cache_status["leaderboard"]["cached"]
+        assert cache_status["tee_times"] == cache_status[next(k for k in cache_status if k.startswith("tee_times:r"))]
+        print(f"✓ Leaderboard cached after flood, {cache_status['evictions']} evictions")
+
+    def test_status_reports_projected_cut(self):
+        """Status reports the cut projected from the current standings"""
+        response = requests.get(f"{BASE_URL}/api/leaderboard/status")
+        assert response.status_code == 200
+        
+        data = response.json()
+        assert "projected_cut" in data
+        cut = data["projected_cut"]
+        if cut is not None:
+            assert cut["players_inside"] >= cut["position"]
+        print(f"✓ Projected cut: {cut}")
+
+    def test_status_reports_staleness_bound(self):
+        """Status reports the stale-while-revalidate bound and how often it was exceeded"""
+        response = requests.get(f"{BASE_URL}/api/leaderboard/status")
+        assert response.status_code == 200
+        
+        swr = response.json()["stale_while_revalidate"]
+        assert swr["max_stale_seconds"] > 0
+        assert swr["too_stale"] >= 0
+        print(f"✓ Stale-while-revalidate: {swr}")
+
+
+class TestLiveLeaderboard:
+    """Test /api/leaderboard/live endpoint"""
+    
+    def test_live_leaderboard(self):
+        """Live leaderboard returns entries from ETX or the local fallback"""
+        response = requests.get(f"{BASE_URL}/api/leaderboard/live")
+        assert response.status_code == 200
+        
+        data = response.json()
+        assert data["source"] in ("etx", "local")
+        assert isinstance(data["entries"], list)
+        assert data["total_count"] == len(data["entries"])
+        assert isinstance(data["stale"], bool)
+        if data["stale"]:
+            assert "Age" in response.headers
+        print(f"✓ Live leaderboard: {data['total_count']} entries from {data['source']}")
+    
+    def test_live_leaderboard_top_filter(self):
+        """Top filter limits the number of entries"""
+        response = requests.get(f"{BASE_URL}/api/leaderboard/live?top=5")
+        assert response.status_code == 200
+        
+        data = response.json()
+        assert len(data["entries"]) <= 5
+        assert data["filters_applied"]["top"] == 5
+        print(f"✓ Top filter: {len(data['entries'])} entries")
+    
+    def test_live_leaderboard_country_filter(self):
+        """Country filter returns only that country's players, in leaderboard order"""
+        response = requests.get(f"{BASE_URL}/api/leaderboard/live?country=ken&top=20")
+        assert response.status_code == 200
+        
+        data = response.json()
+        assert len(data["entries"]) <= 20
+        for entry in data["entries"]:
+            assert (entry.get("country_code") or "").upper() == "KEN"
+        print(f"✓ Country filter: {len(data['entries'])} entries")
+    
+    def test_live_leaderboard_etag(self):
+        """Live leaderboard is cacheable and revalidates with If-None-Match"""
+        response = requests.get(f"{BASE_URL}/api/leaderboard/live?top=10")
+        assert response.status_code == 200
+        assert "max-age" in response.headers.get("Cache-Control", "")
+        
+        etag = response.headers.get("ETag")
+        assert etag
+        
+        revalidated = requests.get(f"{BASE_URL}/api/leaderboard/live?top=10", headers={"If-None-Match": etag})
+        # The snapshot may have refreshed between the two requests
+        if revalidated.status_code == 304:
+            assert revalidated.content == b""
+        else:
+            assert revalidated.status_code == 200
+            assert revalidated.headers.get("ETag") != etag
+        print(f"✓ ETag revalidation: {revalidated.status_code}")
+    
+    def test_filter_variants_have_distinct_etags(self):
+        """Each filter combination gets its own ETag"""
+        all_entries = requests.get(f"{BASE_URL}/api/leaderboard/live")
+        kenyan = requests.get(f"{BASE_URL}/api/leaderboard/live?country=KEN")
+        assert all_entries.status_code == 200
+        assert kenyan.status_code == 200
+        assert all_entries.headers.get("ETag") != kenyan.headers.get("ETag")
+        print("✓ Filter variants have distinct ETags")
+    
+    def test_tee_times_are_round_specific(self):
+        """Each round's tee times are served for that round"""
+        for round_num in (1, 2):
+            response = requests.get(f"{BASE_URL}/api/leaderboard/tee-times?round_num={round_num}")
+            assert response.status_code == 200
+            assert response.json()["round"] == round_num
+        print("✓ Tee times are round specific")
+    
+    def test_kenyan_players_keep_leaderboard_order(self):
+        """Kenyan players are enriched in parallel but keep leaderboard order"""
+        response = requests.get(f"{BASE_URL}/api/leaderboard/kenyan-players")
+        assert response.status_code == 200
+        
+        data = response.json()
+        assert data["kenyan_player_count"] == len(data["players"])
+        
+        live = requests.get(f"{BASE_URL}/api/leaderboard/live?country=KEN").json()
+        assert [p.get("player_id") for p in data["players"]] == [e.get("player_id") for e in live["entries"]]
+        print(f"✓ Kenyan players: {data['kenyan_player_count']} enriched")
+
+
+
+class TestLeaderboardStream:
+    """Test /api/leaderboard/stream SSE endpoint"""
+    
+    def test_stream_starts_with_snapshot(self):
+        """Stream opens with a full leaderboard snapshot event"""
+        with requests.get(f"{BASE_URL}/api/leaderboard/stream", stream=True, timeout=30) as response:
+            assert response.status_code == 200
+            assert response.headers["content-type"].startswith("text/event-stream")
+            
+            lines = []
+            for line in response.iter_lines(decode_unicode=True):
+                if not line:
+                    break
+                lines.append(line)
+        
+        assert "event: snapshot" in lines
+        data_line = next(line for line in lines if line.startswith("data: "))
+        assert '"entries"' in data_line
+        print(f"✓ Stream snapshot received ({len(data_line)} bytes)")
+
+
+class TestLeaderboardChanges:
+    """Test /api/leaderboard/changes endpoint"""
+    
+    def test_changes_without_version_returns_full_board(self):
+        """since=0 resets the client with the full board and its version"""
+        response = requests.get(f"{BASE_URL}/api/leaderboard/changes")
+        assert response.status_code == 200
+        
+        data = response.json()
+        assert data["reset"] is True
+        assert isinstance(data["entries"], list)
+        assert data["version"] >= 0
+        print(f"✓ Changes reset: {len(data['entries'])} entries at version {data['version']}")
+    
+    def test_changes_since_current_version(self):
+        """Catching up from the current version returns only what changed since"""
+        reset = requests.get(f"{BASE_URL}/api/leaderboard/changes").json()
+        version, epoch = reset["version"], reset["epoch"]
+        if version == 0:
+            pytest.skip("No ETX snapshot published yet")
+        
+        response = requests.get(f"{BASE_URL}/api/leaderboard/changes?since={version}&epoch={epoch}")
+        assert response.status_code == 200
+        
+        data = response.json()
+        assert data["reset"] is False
+        assert data["version"] >= version
+        for change in data["changed"]:
+            assert "player_id" in change
+        print(f"✓ Changes since {version}: {len(data['changed'])} changed")
+    
+    def test_changes_from_another_engine_returns_full_board(self):
+        """A version from another worker's engine (different epoch) resets the client"""
+        response = requests.get(f"{BASE_URL}/api/leaderboard/changes?since=1&epoch=not-this-server")
+        assert response.status_code == 200
+        
+        data = response.json()
+        assert data["reset"] is True
+        assert isinstance(data["entries"], list)
+        assert data["epoch"] and data["epoch"] != "not-this-server"
+        print(f"✓ Foreign epoch reset to {data['epoch']} at version {data['version']}")
+
+
+class TestLeaderboardHistory:
+    """Test /api/leaderboard/history endpoints"""
+    
+    def test_leaderboard_at_time(self):
+        """The board at a past time is rebuilt from stored history"""
+        response = requests.get(f"{BASE_URL}/api/leaderboard/history/at", params={"time": "2099-01-01T00:00:00Z", "top": 5})
+        # 404 until the first snapshot has been recorded
+        assert response.status_code in (200, 404)
+        if response.status_code == 200:
+            data = response.json()
+            assert len(data["entries"]) <= 5
+            assert data["leader"] == (data["entries"][0] if data["entries"] else None)
+        print(f"✓ Leaderboard at time: {response.status_code}")
+    
+    def test_leaderboard_at_invalid_time(self):
+        """An unparseable time is rejected"""
+        response = requests.get(f"{BASE_URL}/api/leaderboard/history/at", params={"time": "half past two"})
+        assert response.status_code == 400
+        print("✓ Invalid history time rejected")
+    
+    def test_player_history(self):
+        """Player history returns a time-ordered list of points"""
+        response = requests.get(f"{BASE_URL}/api/leaderboard/history/player/unknown-player?round_num=3")
+        assert response.status_code == 200
+        
+        data = response.json()
+        assert data["round"] == 3
+        assert data["total_count"] == len(data["points"])
+        print(f"✓ Player history: {data['total_count']} points")
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v", "--tb=short"])
@@ -144,6 +144,77 @@ class TestVolunteerQuery:
         data = response.json()
         assert data["filters_applied"].get("karen_member") == False
     
+    def test_karen_filters_partition_volunteers(self, auth_headers):
+        """Karen and non-Karen results split the volunteers exactly, using the stored flag where present"""
+        url = f"{BASE_URL}/api/marshal/volunteers/query"
+        everyone = requests.post(url, headers=auth_headers, json={"stats_only": True}).json()
+        karen = requests.post(url, headers=auth_headers, json={"karen_member": True}).json()
+        non_karen = requests.post(url, headers=auth_headers, json={"karen_member": False}).json()
+        
+        assert karen["total"] + non_karen["total"] == everyone["total"]
+        assert everyone["statistics"]["karen_members"] == karen["total"]
+        for vol in karen["volunteers"]:
+            assert vol.get("is_karen_member") in (True, None)
+        for vol in non_karen["volunteers"]:
+            assert vol.get("is_karen_member") in (False, None)
+    
+    def test_query_search_by_name_prefix(self, auth_headers):
+        """Search matches word prefixes, case-insensitively, and treats input literally"""
+        url = f"{BASE_URL}/api/marshal/volunteers/query"
+        volunteers = requests.post(url, headers=auth_headers, json={"limit": 1}).json()["volunteers"]
+        if not volunteers:
+            pytest.skip("No volunteers to search")
+        last_name = volunteers[0]["last_name"]
+        
+        response = requests.post(url, headers=auth_headers, json={"search": last_name[:3].upper()})
+        assert response.status_code == 200
+        data = response.json()
+        assert data["filters_applied"]["search"] == last_name[:3].upper()
+        assert any(vol["last_name"] == last_name for vol in data["volunteers"])
+        assert all("search_tokens" not in vol for vol in data["volunteers"])
+        
+        response = requests.post(url, headers=auth_headers, json={"search": "(.*"})
+        assert response.status_code == 200
+    
+    def test_dashboard_stats_match_query(self, auth_headers):
+        """Dashboard stats and query statistics agree (both served from the same roster)"""
+        stats = requests.get(f"{BASE_URL}/api/marshal/stats", headers=auth_headers).json()
+        query = requests.post(
+            f"{BASE_URL}/api/marshal/volunteers/query",
+            headers=auth_headers,
+            json={"stats_only": True}
+        ).json()
+        
+        assert stats["total"] == query["total"]
+        for status in ("pending", "approved", "rejected"):
+            assert stats[status] == query["statistics"]["by_status"][status]
+    
+    def test_query_reflects_update_immediately(self, auth_headers):
+        """A volunteer update is visible to the next query (the roster re-reads written volunteers)"""
+        url = f"{BASE_URL}/api/marshal/volunteers/query"
+        volunteers = requests.post(url, headers=auth_headers, json={"limit": 1, "fields": ["volunteer_id", "notes"]}).json()["volunteers"]
+        if not volunteers:
+            pytest.skip("No volunteers")
+        volunteer = volunteers[0]
+        
+        notes = f"roster check {os.getpid()}"
+        response = requests.put(
+            f"{BASE_URL}/api/marshal/volunteers/{volunteer['volunteer_id']}",
+            headers=auth_headers,
+            json={"notes": notes}
+        )
+        assert response.status_code == 200
+        try:
+            page = requests.post(url, headers=auth_headers, json={"limit": 1, "fields": ["volunteer_id", "notes"]}).json()
+            assert page["volunteers"][0]["volunteer_id"] == volunteer["volunteer_id"]
+            assert page["volunteers"][0]["notes"] == notes
+        finally:
+            requests.put(
+                f"{BASE_URL}/api/marshal/volunteers/{volunteer['volunteer_id']}",
+                headers=auth_headers,
+                json={"notes": volunteer.get("notes") or ""}
+            )
+    
     def test_query_by_day(self, auth_headers):
         """Query by day availability"""
         response = requests.post(
@@ -156,6 +227,38 @@ class TestVolunteerQuery:
         
         assert data["filters_applied"].get("days") == ["thursday", "friday"]
     
+    def test_query_unknown_day_rejected(self, auth_headers):
+        """Unknown day names are a 400 on both the query and the roster availability endpoint"""
+        response = requests.post(
+            f"{BASE_URL}/api/marshal/volunteers/query",
+            headers=auth_headers,
+            json={"days": ["funday"]}
+        )
+        assert response.status_code == 400
+        
+        response = requests.get(f"{BASE_URL}/api/marshal/roster/availability?days=funday", headers=auth_headers)
+        assert response.status_code == 400
+    
+    def test_roster_availability_matches_query(self, auth_headers):
+        """The in-memory availability index selects the same volunteers as the query engine"""
+        response = requests.get(
+            f"{BASE_URL}/api/marshal/roster/availability",
+            headers=auth_headers,
+            params={"days": "friday,saturday", "time_slots": "morning", "status": "approved"}
+        )
+        assert response.status_code == 200
+        roster = response.json()
+        assert set(roster["coverage"]) == {"thursday", "friday", "saturday", "sunday"}
+        assert set(roster["coverage"]["friday"]) == {"morning", "afternoon", "all_day"}
+        
+        query = requests.post(
+            f"{BASE_URL}/api/marshal/volunteers/query",
+            headers=auth_headers,
+            json={"days": ["friday", "saturday"], "time_slots": ["morning"], "status": "approved", "fields": ["volunteer_id"]}
+        ).json()
+        assert roster["total"] == query["total"]
+        assert set(roster["volunteer_ids"]) == {vol["volunteer_id"] for vol in query["volunteers"]}
+    
     def test_query_by_time_slot(self, auth_headers):
         """Query by time slot (requires day filter)"""
         response = requests.post(
@@ -228,6 +331,68 @@ class TestVolunteerQuery:
         assert filters.get("role") == "marshal"
         assert filters.get("status") == "approved"
         assert filters.get("karen_member") == True
+    
+    def test_query_pages_match_full_result(self, auth_headers):
+        """Walking the cursor pages yields the same volunteers as the unpaged query"""
+        url = f"{BASE_URL}/api/marshal/volunteers/query"
+        full = requests.post(url, headers=auth_headers, json={"role": "marshal"}).json()
+        
+        paged_ids, cursor = [], None
+        while True:
+            body = {"role": "marshal", "limit": 25, "fields": ["first_name", "phone"]}
+            if cursor:
+                body["cursor"] = cursor
+            response = requests.post(url, headers=auth_headers, json=body)
+            assert response.status_code == 200
+            page = response.json()
+            assert page["total"] == full["total"]
+            assert len(page["volunteers"]) <= 25
+            for vol in page["volunteers"]:
+                assert "email" not in vol
+            paged_ids += [vol["volunteer_id"] for vol in page["volunteers"]]
+            cursor = page["next_cursor"]
+            if not cursor:
+                break
+        
+        assert sorted(paged_ids) == sorted(vol["volunteer_id"] for vol in full["volunteers"])
+        assert len(paged_ids) == len(set(paged_ids))
+    
+    def test_query_stats_only(self, auth_headers):
+        """stats_only returns the same statistics without any volunteers"""
+        url = f"{BASE_URL}/api/marshal/volunteers/query"
+        full = requests.post(url, headers=auth_headers, json={"karen_member": True}).json()
+        response = requests.post(url, headers=auth_headers, json={"karen_member": True, "stats_only": True})
+        assert response.status_code == 200
+        
+        data = response.json()
+        assert data["volunteers"] == []
+        assert data["statistics"] == full["statistics"]
+        assert data["total"] == full["total"] == len(full["volunteers"])
+        assert data["statistics"]["karen_members"] == data["total"]
+    
+    def test_query_invalid_cursor(self, auth_headers):
+        """A malformed cursor is rejected"""
+        response = requests.post(
+            f"{BASE_URL}/api/marshal/volunteers/query",
+            headers=auth_headers,
+            json={"limit": 10, "cursor": "not-a-cursor"}
+        )
+        assert response.status_code == 400
+    
+    def test_volunteer_list_page(self, auth_headers):
+        """The volunteer list returns a page with a count-based total when limit is given"""
+        response = requests.get(
+            f"{BASE_URL}/api/marshal/volunteers",
+            headers=auth_headers,
+            params={"limit": 10, "fields": "first_name,last_name"}
+        )
+        assert response.status_code == 200
+        data = response.json()
+        assert len(data["volunteers"]) <= 10
+        assert data["total"] >= len(data["volunteers"])
+        assert (data["next_cursor"] is not None) == (data["total"] > 10)
+        for vol in data["volunteers"]:
+            assert set(vol) <= {"volunteer_id", "status", "first_name", "last_name"}
 
 
 class TestAssignmentLocations:
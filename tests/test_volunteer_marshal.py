@@ -159,6 +159,16 @@ class TestMarshalAuthentication:
         assert response.status_code == 401
         print("✓ Unauthenticated access correctly rejected")
     
+    def test_marshal_me_with_garbage_signed_token(self):
+        """Forged or malformed signed tokens are rejected with 401, not a server error"""
+        for token in ("v1.", "v1.abc.é", "v1.é.abc", "v1.W10.bad"):
+            response = requests.get(
+                f"{BASE_URL}/api/marshal/me",
+                headers={"Authorization": f"Bearer {token}"}
+            )
+            assert response.status_code == 401, f"{token!r}: {response.status_code}"
+        print("✓ Malformed signed tokens rejected")
+    
     def test_marshal_me_with_auth(self):
         """Test /marshal/me with valid session"""
         # Login first
@@ -196,6 +206,23 @@ class TestMarshalAuthentication:
         assert response.status_code == 200
         assert response.json()["success"] == True
         print("✓ Marshal logout successful")
+    
+    def test_marshal_session_rejected_after_logout(self):
+        """A cached session stops working as soon as it is logged out"""
+        login_response = requests.post(
+            f"{BASE_URL}/api/marshal/login",
+            json=CHIEF_MARSHAL_CREDENTIALS
+        )
+        headers = {"Authorization": f"Bearer {login_response.json()['session_id']}"}
+        
+        # Authenticate twice so the second request is served from the session cache
+        for _ in range(2):
+            assert requests.get(f"{BASE_URL}/api/marshal/me", headers=headers).status_code == 200
+        
+        requests.post(f"{BASE_URL}/api/marshal/logout", headers=headers)
+        response = requests.get(f"{BASE_URL}/api/marshal/me", headers=headers)
+        assert response.status_code == 401
+        print("✓ Logged out session rejected")
 
 
 class TestMarshalDashboard: